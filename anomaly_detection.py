@@ -0,0 +1,121 @@
+"""
+Anomaly detection - flag abnormal spikes in daily case volume per priority,
+country and industry.
+
+All segment series are stacked into one (segments × days) count matrix and
+scored at once: either a trailing rolling median / MAD robust z-score
+(sliding-window view, no Python loop over individual series or days) or an EWMA
+z-score (pandas' column-wise ewm). Each day is compared only with the days
+before it.
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+import config
+
+# MAD -> standard deviation for normally distributed data
+MAD_SCALE = 1.4826
+
+
+def daily_segment_counts(cases: pd.DataFrame, accounts: pd.DataFrame, dimensions):
+    """Stack daily case counts for every segment of every dimension.
+
+    Returns (counts, segments, dates): an int matrix of shape
+    (segments, days), a frame with the dimension/segment of each row and
+    the 'YYYY-MM-DD' date of each column. Cases with a missing segment
+    value are left out of that dimension.
+    """
+    account_columns = [dim for dim in dimensions if dim in accounts.columns and dim not in cases.columns]
+    frame = cases[['account_sfid', 'case_created_date'] + [dim for dim in dimensions if dim in cases.columns]]
+    if account_columns:
+        frame = frame.merge(accounts[['account_sfid'] + account_columns], on='account_sfid', how='left')
+
+    days = pd.to_datetime(frame['case_created_date']).to_numpy(dtype='datetime64[D]')
+    valid = ~np.isnat(days)
+    if not valid.any():
+        return np.zeros((0, 0), dtype=np.int64), pd.DataFrame(columns=['dimension', 'segment']), np.array([], dtype=str)
+
+    origin = days[valid].min()
+    n_days = int((days[valid].max() - origin).astype(np.int64)) + 1
+    day_index = (days - origin).astype(np.int64)
+
+    blocks, segments = [], []
+    for dim in dimensions:
+        codes, labels = pd.factorize(frame[dim], sort=True)
+        keep = valid & (codes >= 0)
+        counts = np.bincount(codes[keep] * n_days + day_index[keep], minlength=len(labels) * n_days)
+        blocks.append(counts.reshape(len(labels), n_days))
+        segments.append(pd.DataFrame({'dimension': dim, 'segment': labels}))
+
+    dates = (origin + np.arange(n_days)).astype(str)
+    return np.vstack(blocks), pd.concat(segments, ignore_index=True), dates
+
+
+def rolling_mad_scores(counts, window, min_scale=1.0, block_rows=256):
+    """Robust z-score of each day against the median/MAD of the previous `window` days"""
+    n_series, n_days = counts.shape
+    baseline = np.full((n_series, n_days), np.nan)
+    scores = np.full((n_series, n_days), np.nan)
+    if n_days <= window:
+        return scores, baseline
+
+    # windows[:, t] covers days t .. t+window-1 and is the baseline for day t+window.
+    # np.median copies its input, so rows are processed in blocks to bound memory.
+    windows = sliding_window_view(counts.astype(np.float64), window, axis=1)[:, :-1]
+    for start in range(0, n_series, block_rows):
+        rows = slice(start, start + block_rows)
+        median = np.median(windows[rows], axis=2)
+        mad = np.median(np.abs(windows[rows] - median[:, :, None]), axis=2)
+        scale = np.maximum(MAD_SCALE * mad, min_scale)
+        baseline[rows, window:] = median
+        scores[rows, window:] = (counts[rows, window:] - median) / scale
+    return scores, baseline
+
+
+def ewma_scores(counts, span, warmup, min_scale=1.0):
+    """z-score of each day against the EWMA mean/std of the previous days"""
+    series = pd.DataFrame(counts.T.astype(np.float64))
+    ewm = series.ewm(span=span, adjust=False)
+    mean = ewm.mean().shift(1).to_numpy().T
+    std = ewm.std().shift(1).to_numpy().T
+    scores = (counts - mean) / np.maximum(np.nan_to_num(std), min_scale)
+    scores[:, :warmup] = np.nan
+    mean[:, :warmup] = np.nan
+    return scores, mean
+
+
+def detect_anomalies(cases: pd.DataFrame, accounts: pd.DataFrame, dimensions=None, method=None,
+                     window=None, threshold=None, min_cases=None) -> pd.DataFrame:
+    """Ranked table of (date, dimension, segment) spikes in daily case volume"""
+    dimensions = config.ANOMALY_DIMENSIONS if dimensions is None else dimensions
+    method = config.ANOMALY_METHOD if method is None else method
+    window = config.ANOMALY_WINDOW_DAYS if window is None else window
+    threshold = config.ANOMALY_THRESHOLD if threshold is None else threshold
+    min_cases = config.ANOMALY_MIN_CASES if min_cases is None else min_cases
+
+    counts, segments, dates = daily_segment_counts(cases, accounts, dimensions)
+    if method == 'mad':
+        scores, baseline = rolling_mad_scores(counts, window)
+    elif method == 'ewma':
+        scores, baseline = ewma_scores(counts, config.ANOMALY_EWMA_SPAN, warmup=window)
+    else:
+        raise ValueError(f"Unknown anomaly detection method: {method}")
+
+    flagged = np.nan_to_num(scores, nan=-np.inf) >= threshold
+    flagged &= counts >= min_cases
+    rows, cols = np.nonzero(flagged)
+
+    anomalies = pd.DataFrame({
+        'date': dates[cols],
+        'dimension': segments['dimension'].to_numpy()[rows],
+        'segment': segments['segment'].to_numpy()[rows],
+        'cases_created': counts[rows, cols],
+        'baseline': baseline[rows, cols],
+        'score': scores[rows, cols],
+    })
+    anomalies['method'] = method
+    anomalies = anomalies.sort_values(['score', 'cases_created'], ascending=False, kind='stable')
+    anomalies.insert(0, 'rank', np.arange(1, len(anomalies) + 1))
+    return anomalies.reset_index(drop=True)
@@ -6,13 +6,34 @@ import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 
-# File paths
+# File paths (.json, .jsonl, .csv, .parquet or a SQLite .db with
+# 'accounts' / 'support_cases' tables)
 ACCOUNTS_FILE = os.path.join(DATA_DIR, 'accounts_anonymized.json')
 SUPPORT_CASES_FILE = os.path.join(DATA_DIR, 'support_cases_anonymized.json')
 
+# Loading settings
+PARALLEL_LOAD = True
+LOAD_WORKER_TYPE = 'process'  # 'process' or 'thread' (GIL-bound)
+
+# Pushdown filters applied while reading the sources, e.g.
+# {'case_created_date': ('2024-01-01', '2024-03-31'),
+#  'account_country': ['Brazil', 'Mexico'],
+#  'account_industry': ['Pharmaceuticals']}
+LOAD_FILTERS = {}
+
+# Memory-bounded mode: RSS budget in MB (None = unlimited). Raw frames are
+# freed once KPIs exist and intermediate results spill to SPILL_DIR once the
+# RSS reaches MEMORY_SPILL_THRESHOLD of the budget.
+MEMORY_BUDGET_MB = None
+MEMORY_SPILL_THRESHOLD = 0.8
+RELOAD_CHUNK_ROWS = 100_000  # rows per read when a released source is re-read from SQLite
+
 # Output settings
 OUTPUT_DIR = os.path.join(BASE_DIR, 'outputs')
 VISUALIZATIONS_DIR = os.path.join(OUTPUT_DIR, 'visualizations')
+KPI_CUBE_FILE = os.path.join(OUTPUT_DIR, 'kpi_cube.npz')
+SPILL_DIR = os.path.join(OUTPUT_DIR, '.spill')
+STAGING_DIR = os.path.join(OUTPUT_DIR, '.staging')  # per-source SQLite files
 
 # Create directories if they don't exist
 os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -26,4 +47,40 @@ COLOR_PALETTE = 'viridis'
 # Analysis parameters
 TOP_N_ACCOUNTS = 15
 TOP_N_COUNTRIES = 15
-TOP_N_INDUSTRIES = 12
\ No newline at end of file
+TOP_N_INDUSTRIES = 12
+
+# SLA targets (days from creation to close) per case priority
+SLA_TARGET_DAYS = {
+    'Critical': 1,
+    'Urgent': 1,
+    'High': 3,
+    'Medium': 7,
+    'Normal': 7,
+    'Low': 14,
+}
+SLA_DEFAULT_DAYS = 14
+
+# Open-case aging buckets as inclusive (min_days, max_days); None = open-ended
+AGING_BUCKETS = [(0, 7), (8, 30), (31, 90), (91, None)]
+
+# Anomaly detection over daily case volume
+ANOMALY_DIMENSIONS = ['case_priority', 'account_country', 'account_industry']
+ANOMALY_METHOD = 'mad'  # 'mad' (rolling median/MAD) or 'ewma'
+ANOMALY_WINDOW_DAYS = 28
+ANOMALY_EWMA_SPAN = 14
+ANOMALY_THRESHOLD = 3.5
+ANOMALY_MIN_CASES = 5
+
+# KPI verification: golden fingerprints and float rounding before hashing
+GOLDEN_FINGERPRINTS_FILE = os.path.join(BASE_DIR, 'golden', 'kpi_fingerprints.json')
+FINGERPRINT_TOLERANCE = 1e-6
+
+# Report settings
+REPORT_TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+REPORT_FILE = os.path.join(OUTPUT_DIR, 'ANALYSIS_REPORT.md')
+REPORT_HTML_FILE = os.path.join(OUTPUT_DIR, 'ANALYSIS_REPORT.html')
+REPORT_CACHE_DIR = os.path.join(OUTPUT_DIR, '.report_cache')
+SEGMENT_REPORTS_DIR = os.path.join(OUTPUT_DIR, 'reports', 'segments')
+REPORT_SEGMENT_DIMENSIONS = ['account_country', 'account_industry']
+REPORT_TABLE_ROWS = 10
+REPORT_WORKERS = 4
@@ -0,0 +1,240 @@
+"""
+Input connectors - read the accounts / support cases sources from different
+storage formats with column and predicate pushdown.
+
+Every connector exposes `read(columns=None, filters=None)`:
+
+- `columns`: only these columns are kept (missing ones are simply absent,
+  validation is left to the caller).
+- `filters`: {column: value or [allowed values]} or {column: (start, end)} for an
+  inclusive date range. A date-only `end` such as '2024-03-31' covers the
+  whole day. Either bound may be None.
+
+Backends push the filters down as far as the format allows (SQL WHERE for
+SQLite, row-group filters for Parquet, chunk-by-chunk filtering for CSV and
+JSON Lines) so only matching rows are held in memory.
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def _date_bounds(condition):
+    """(start, end) -> (lower, upper, upper_inclusive) as Timestamps"""
+    start, end = condition
+    lower = pd.Timestamp(start) if start is not None else None
+    upper, inclusive = None, True
+    if end is not None:
+        upper = pd.Timestamp(end)
+        if upper == upper.normalize():
+            # Date-only end bound: include the whole day
+            upper, inclusive = upper + pd.Timedelta(days=1), False
+    return lower, upper, inclusive
+
+
+def _filter_values(condition):
+    """Allowed values of a value-list filter; a bare string is one value"""
+    if isinstance(condition, str):
+        return [condition]
+    return list(condition)
+
+
+def apply_filters(df, filters):
+    """Filter a DataFrame in memory with the connector filter spec"""
+    if not filters or df.empty:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for column, condition in filters.items():
+        if isinstance(condition, tuple):
+            lower, upper, inclusive = _date_bounds(condition)
+            values = pd.to_datetime(df[column])
+            if lower is not None:
+                mask &= values >= lower
+            if upper is not None:
+                mask &= (values <= upper) if inclusive else (values < upper)
+        else:
+            mask &= df[column].isin(_filter_values(condition))
+    return df[mask]
+
+
+def _select_columns(df, columns):
+    if columns is None:
+        return df
+    return df[[col for col in columns if col in df.columns]]
+
+
+class Connector:
+    """Base class for input sources"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def read(self, columns=None, filters=None) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.path!r})"
+
+
+class JSONConnector(Connector):
+    """A JSON array of records (the original export format).
+
+    The array has to be parsed whole; filters and column selection are
+    applied right after parsing. Prefer JSON Lines for large sources.
+    """
+
+    def read(self, columns=None, filters=None) -> pd.DataFrame:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            df = pd.DataFrame(json.load(f))
+        return _select_columns(apply_filters(df, filters), columns).reset_index(drop=True)
+
+
+class _ChunkedConnector(Connector):
+    """Shared chunk-by-chunk filtering for the streaming text formats"""
+
+    def __init__(self, path: str, chunksize: int = DEFAULT_CHUNKSIZE):
+        super().__init__(path)
+        self.chunksize = chunksize
+
+    def _chunks(self, columns):
+        raise NotImplementedError
+
+    def read(self, columns=None, filters=None) -> pd.DataFrame:
+        # Filter columns must be read even if the caller doesn't keep them
+        needed = None
+        if columns is not None:
+            needed = list(dict.fromkeys(list(columns) + list(filters or {})))
+        parts = [
+            _select_columns(apply_filters(chunk, filters), columns)
+            for chunk in self._chunks(needed)
+        ]
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(parts, ignore_index=True)
+
+
+class JSONLinesConnector(_ChunkedConnector):
+    """One JSON record per line, streamed in chunks"""
+
+    def _chunks(self, columns):
+        reader = pd.read_json(self.path, lines=True, chunksize=self.chunksize,
+                              convert_dates=False, dtype=False)
+        with reader:
+            for chunk in reader:
+                yield _select_columns(chunk, columns)
+
+
+class CSVConnector(_ChunkedConnector):
+    """Comma-separated file with a header row, streamed in chunks"""
+
+    def _chunks(self, columns):
+        usecols = (lambda col: col in columns) if columns is not None else None
+        with pd.read_csv(self.path, usecols=usecols, chunksize=self.chunksize) as reader:
+            yield from reader
+
+
+class ParquetConnector(Connector):
+    """Parquet file or dataset directory (requires pyarrow)"""
+
+    def read(self, columns=None, filters=None) -> pd.DataFrame:
+        read_columns = None
+        if columns is not None:
+            read_columns = list(dict.fromkeys(list(columns) + list(filters or {})))
+
+        pushdown = []
+        for column, condition in (filters or {}).items():
+            if isinstance(condition, tuple):
+                lower, upper, inclusive = _date_bounds(condition)
+                if lower is not None:
+                    pushdown.append((column, '>=', lower))
+                if upper is not None:
+                    pushdown.append((column, '<=' if inclusive else '<', upper))
+            else:
+                pushdown.append((column, 'in', _filter_values(condition)))
+
+        try:
+            df = pd.read_parquet(self.path, columns=read_columns, filters=pushdown or None)
+        except (TypeError, ValueError, NotImplementedError):
+            # Date bounds can't be pushed down to string-typed date columns;
+            # push the value lists only and finish the ranges in memory.
+            pushdown = [f for f in pushdown if f[1] == 'in']
+            df = pd.read_parquet(self.path, columns=read_columns, filters=pushdown or None)
+
+        return _select_columns(apply_filters(df, filters), columns).reset_index(drop=True)
+
+
+class SQLiteConnector(Connector):
+    """A table in a SQLite database file; filters become a WHERE clause"""
+
+    def __init__(self, path: str, table: str):
+        super().__init__(path)
+        self.table = table
+
+    def read(self, columns=None, filters=None) -> pd.DataFrame:
+        # sqlite3's own context manager only ends the transaction
+        with contextlib.closing(sqlite3.connect(self.path)) as conn:
+            available = [row[1] for row in conn.execute(f'PRAGMA table_info("{self.table}")')]
+            if not available:
+                raise ValueError(f"Table {self.table!r} not found in {self.path}")
+            selected = available if columns is None else [col for col in columns if col in available]
+
+            clauses, params = [], []
+            for column, condition in (filters or {}).items():
+                if isinstance(condition, tuple):
+                    lower, upper, inclusive = _date_bounds(condition)
+                    # Compare as julian days, not text: date-only and
+                    # full timestamp values must order the same way
+                    if lower is not None:
+                        clauses.append(f'julianday("{column}") >= julianday(?)')
+                        params.append(lower.isoformat(sep=' '))
+                    if upper is not None:
+                        clauses.append(f'julianday("{column}") {"<=" if inclusive else "<"} julianday(?)')
+                        params.append(upper.isoformat(sep=' '))
+                else:
+                    values = _filter_values(condition)
+                    if not values:
+                        clauses.append('0')
+                        continue
+                    clauses.append(f'"{column}" IN ({", ".join("?" * len(values))})')
+                    params.extend(values)
+
+            select_list = ', '.join(f'"{col}"' for col in selected)
+            query = f'SELECT {select_list} FROM "{self.table}"'
+            if clauses:
+                query += ' WHERE ' + ' AND '.join(clauses)
+            return pd.read_sql_query(query, conn, params=params)
+
+    def __repr__(self):
+        return f"SQLiteConnector({self.path!r}, table={self.table!r})"
+
+
+CONNECTORS_BY_EXTENSION = {
+    '.json': JSONConnector,
+    '.jsonl': JSONLinesConnector,
+    '.ndjson': JSONLinesConnector,
+    '.csv': CSVConnector,
+    '.parquet': ParquetConnector,
+    '.pq': ParquetConnector,
+    '.db': SQLiteConnector,
+    '.sqlite': SQLiteConnector,
+    '.sqlite3': SQLiteConnector,
+}
+
+
+def connector_for_path(path: str, table: str = None) -> Connector:
+    """Pick a connector from the file extension (SQLite sources need `table`)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in CONNECTORS_BY_EXTENSION:
+        raise ValueError(f"No connector for {path!r} (supported: {sorted(CONNECTORS_BY_EXTENSION)})")
+    connector_cls = CONNECTORS_BY_EXTENSION[extension]
+    if connector_cls is SQLiteConnector:
+        if table is None:
+            raise ValueError(f"A table name is required to read from {path!r}")
+        return connector_cls(path, table)
+    return connector_cls(path)
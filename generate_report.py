@@ -0,0 +1,604 @@
+"""
+Report generator - renders ANALYSIS_REPORT.md (and an HTML twin) from the
+computed KPI tables, chart paths and the run's timing record.
+
+Each report section is fingerprinted from the KPI data it is built from, so
+a re-run only re-renders the sections whose inputs changed. Segment reports
+(per country, per industry, ...) are sliced from a single grouped
+aggregation and rendered in parallel worker processes.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+import string
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+import config
+from memory_budget import SpilledFrame, stored_value
+
+SEGMENT_DIMENSIONS = {
+    'account_country': 'Country',
+    'account_industry': 'Industry',
+}
+
+# Segment report for accounts with a NULL country / industry (key None)
+UNKNOWN_SEGMENT_LABEL = 'Unknown'
+
+
+def _fingerprint(*inputs):
+    """Stable hash of the DataFrames / plain values a section is built from"""
+    digest = hashlib.sha256()
+    for item in inputs:
+        if isinstance(item, pd.DataFrame):
+            digest.update(json.dumps(list(map(str, item.columns))).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(item, index=False).values.tobytes())
+        elif isinstance(item, SpilledFrame):
+            digest.update(item.digest().encode('utf-8'))
+        else:
+            digest.update(json.dumps(item, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _format_value(value):
+    """Format a single table cell"""
+    if pd.isna(value):
+        return '—'
+    if isinstance(value, float):
+        return f'{value:,.2f}'
+    return str(value)
+
+
+def _markdown_table(df):
+    """Render a DataFrame as a GitHub-flavoured Markdown table"""
+    header = '| ' + ' | '.join(map(str, df.columns)) + ' |'
+    separator = '| ' + ' | '.join('---' for _ in df.columns) + ' |'
+    rows = [
+        '| ' + ' | '.join(_format_value(value) for value in row) + ' |'
+        for row in df.itertuples(index=False)
+    ]
+    return '\n'.join([header, separator] + rows)
+
+
+def _html_table(df):
+    """Render a DataFrame as an HTML table"""
+    return df.to_html(index=False, border=0, na_rep='—', float_format=lambda v: f'{v:,.2f}')
+
+
+def _render_blocks(blocks, fmt):
+    """Render a list of (kind, payload) blocks to Markdown or HTML"""
+    parts = []
+    for kind, payload in blocks:
+        if fmt == 'md':
+            if kind == 'heading':
+                parts.append(f'### {payload}')
+            elif kind == 'bullets':
+                parts.append('\n'.join(f'- {item}' for item in payload))
+            elif kind == 'table':
+                parts.append(_markdown_table(payload))
+            elif kind == 'images':
+                parts.append('\n\n'.join(f'**{label}**\n\n![{label}]({path})' for label, path in payload))
+            elif kind == 'text':
+                parts.append(payload)
+        else:
+            if kind == 'heading':
+                parts.append(f'<h3>{html.escape(payload)}</h3>')
+            elif kind == 'bullets':
+                items = ''.join(f'<li>{html.escape(item)}</li>' for item in payload)
+                parts.append(f'<ul>{items}</ul>')
+            elif kind == 'table':
+                parts.append(_html_table(payload))
+            elif kind == 'images':
+                parts.append(''.join(
+                    f'<figure><img src="{html.escape(path)}" alt="{html.escape(label)}">'
+                    f'<figcaption>{html.escape(label)}</figcaption></figure>'
+                    for label, path in payload
+                ))
+            elif kind == 'text':
+                parts.append(f'<p>{html.escape(payload)}</p>')
+    return '\n\n'.join(parts)
+
+
+def _load_template(name):
+    """Load a string.Template from the templates directory"""
+    with open(os.path.join(config.REPORT_TEMPLATES_DIR, name), 'r', encoding='utf-8') as f:
+        return string.Template(f.read())
+
+
+def _load_cache(path):
+    """Load a section cache, tolerating a missing or corrupt file"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, cache):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+
+
+def _slugify(value):
+    if value is None:
+        return 'unknown'
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', str(value)).strip('_').lower()
+    return slug or 'unknown'
+
+
+def _segment_slugs(segments):
+    """Unique file name per segment: values that slugify alike get a hash suffix"""
+    slugs = {segment: _slugify(segment) for segment in segments}
+    counts = Counter(slugs.values())
+    return {
+        segment: slug if counts[slug] == 1 else
+        f"{slug}_{hashlib.sha256(str(segment).encode('utf-8')).hexdigest()[:8]}"
+        for segment, slug in slugs.items()
+    }
+
+
+def _render_segment_report(job):
+    """Render one segment report in a worker process and write it to disk"""
+    for fmt, template_name, output_path in job['outputs']:
+        template = _load_template(template_name)
+        values = {key: _render_blocks(blocks, fmt) for key, blocks in job['sections'].items()}
+        values.update(job['fields'])
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(template.safe_substitute(values))
+    return job['segment']
+
+
+def _top_accounts_share(kpi_accounts):
+    """(number of accounts, % of cases) for the top 20% of accounts, None without cases"""
+    total_cases = kpi_accounts['total_cases'].sum()
+    if not total_cases:
+        return None
+    top_n = max(1, int(len(kpi_accounts) * 0.2))
+    return top_n, kpi_accounts['total_cases'].head(top_n).sum() / total_cases * 100
+
+
+class ReportGenerator:
+    """Build the analysis report from a pipeline whose KPIs are calculated"""
+
+    def __init__(self, pipeline, formats=('md', 'html')):
+        self.pipeline = pipeline
+        self.formats = formats
+        self.report_date = datetime.now().strftime('%B %d, %Y')
+
+    # ------------------------------------------------------------------
+    # Main report
+    # ------------------------------------------------------------------
+
+    def _sections(self):
+        """Section name -> (inputs used for the fingerprint, block builder)
+
+        KPI tables spilled in memory-bounded mode are fingerprinted from their
+        spill file; only the builder of a section that has to be re-rendered
+        loads its tables back.
+        """
+        p = self.pipeline
+        stats = p.summary_stats()
+
+        def kpi(name):
+            return stored_value(p, name)
+
+        return {
+            'summary': (
+                [stats, kpi('kpi_cases_per_account'), kpi('kpi_priority_status'), kpi('kpi_industry')],
+                lambda: self._summary_blocks(stats),
+            ),
+            'cases_per_account': ([kpi('kpi_cases_per_account')], self._cases_per_account_blocks),
+            'priority_status': ([kpi('kpi_priority_status')], self._priority_status_blocks),
+            'industry': ([kpi('kpi_industry')], self._industry_blocks),
+            'country': ([kpi('kpi_country')], self._country_blocks),
+            'time_series': ([kpi('kpi_time_series')], self._time_series_blocks),
+            'backlog': ([kpi('kpi_backlog')], self._backlog_blocks),
+            'recommendations': (
+                [kpi('kpi_cases_per_account'), kpi('kpi_priority_status'), kpi('kpi_industry')],
+                self._recommendation_blocks,
+            ),
+            'success_metrics': (
+                [stats, kpi('kpi_cases_per_account'), kpi('kpi_backlog')],
+                lambda: self._success_metric_blocks(stats),
+            ),
+            'visualizations': ([p.chart_paths], self._visualization_blocks),
+            'timings': ([p.timings, p.memory.summary() if p.memory else None], self._timing_blocks),
+        }
+
+    def _summary_blocks(self, stats):
+        kpi_accounts = self.pipeline.kpi_cases_per_account
+        bullets = [
+            f"Total Accounts: {stats['total_accounts']:,}",
+            f"Total Support Cases: {stats['total_cases']:,}",
+            f"Average Cases per Account: {stats['avg_cases_per_account']:.2f}",
+            f"Median Resolution Time: {stats['median_resolution_days']:.2f} days"
+            if pd.notna(stats['median_resolution_days']) else 'Median Resolution Time: —',
+            f"Countries Served: {stats['countries_served']}",
+            f"Industries Served: {stats['industries_served']}",
+        ]
+
+        top = _top_accounts_share(kpi_accounts)
+        if top:
+            bullets.append(f'Top 20% of accounts ({top[0]}) generate {top[1]:.1f}% of all cases')
+
+        resolved = self.pipeline.kpi_priority_status.dropna(subset=['avg_resolution_days'])
+        if not resolved.empty:
+            slowest = resolved.loc[resolved['avg_resolution_days'].idxmax()]
+            bullets.append(
+                f"Slowest resolution: {slowest['case_priority']} / {slowest['case_status']} "
+                f"at {slowest['avg_resolution_days']:.1f} days"
+            )
+
+        industry_days = self.pipeline.kpi_industry['avg_resolution_days'].dropna()
+        if len(industry_days) > 1 and industry_days.min() > 0:
+            spread = (industry_days.max() / industry_days.min() - 1) * 100
+            bullets.append(f'Resolution time varies by up to {spread:.0f}% across industries')
+
+        return [('bullets', bullets)]
+
+    def _cases_per_account_blocks(self):
+        df = self.pipeline.kpi_cases_per_account
+        return [
+            ('heading', '1. Cases per Account'),
+            ('text', f'{len(df):,} accounts with at least one case. '
+                     f'Top {config.REPORT_TABLE_ROWS} by case volume:'),
+            ('table', df.drop(columns=['account_sfid']).head(config.REPORT_TABLE_ROWS)),
+        ]
+
+    def _priority_status_blocks(self):
+        return [
+            ('heading', '2. Priority & Status Analysis'),
+            ('table', self.pipeline.kpi_priority_status),
+        ]
+
+    def _industry_blocks(self):
+        df = self.pipeline.kpi_industry
+        return [
+            ('heading', '3. Industry Performance'),
+            ('text', f'Top {config.REPORT_TABLE_ROWS} of {len(df):,} industries by case volume:'),
+            ('table', df.head(config.REPORT_TABLE_ROWS)),
+        ]
+
+    def _country_blocks(self):
+        return [
+            ('heading', '4. Geographic Analysis'),
+            ('table', self.pipeline.kpi_country),
+        ]
+
+    def _time_series_blocks(self):
+        df = self.pipeline.kpi_time_series
+        blocks = [('heading', '5. Time Series Metrics')]
+        if df.empty:
+            return blocks + [('text', 'No cases in the selected period.')]
+
+        daily = df.groupby('date')['cases_created'].sum()
+        by_priority = (
+            df.groupby('case_priority')['cases_created']
+            .agg(['sum', 'mean', 'max'])
+            .rename(columns={'sum': 'total_cases', 'mean': 'avg_per_day', 'max': 'peak_day'})
+            .reset_index()
+        )
+        blocks.append(('bullets', [
+            f'Period: {daily.index.min()} to {daily.index.max()} ({len(daily):,} active days)',
+            f'Busiest day: {daily.idxmax()} with {int(daily.max()):,} cases',
+            f'Average cases per active day: {daily.mean():.2f}',
+        ]))
+        blocks.append(('table', by_priority))
+        return blocks
+
+    def _backlog_blocks(self):
+        df = self.pipeline.kpi_backlog
+        blocks = [('heading', '6. Backlog & SLA')]
+        if df.empty:
+            return blocks + [('text', 'No cases in the selected period.')]
+
+        last_day = df['date'].max()
+        latest = df[df['date'] == last_day].drop(columns=['date', 'new_sla_breaches'])
+        by_priority = df.groupby('case_priority', dropna=False).agg(
+            peak_open_backlog=('open_backlog', 'max'),
+            peak_sla_breached=('sla_breached_backlog', 'max'),
+            total_sla_breaches=('new_sla_breaches', 'sum'),
+        ).reset_index()
+        blocks.append(('text', f'Open backlog by age at the end of {last_day}:'))
+        blocks.append(('table', latest))
+        blocks.append(('text', 'Peaks and SLA breaches over the whole period:'))
+        blocks.append(('table', by_priority))
+        return blocks
+
+    def _recommendation_blocks(self):
+        kpi_accounts = self.pipeline.kpi_cases_per_account
+        blocks = [('heading', 'Recommendation 1: Proactive Account Management')]
+        top = _top_accounts_share(kpi_accounts)
+        if top:
+            top_n, top_share = top
+            busiest = kpi_accounts.iloc[0]
+            blocks += [
+                ('text', f'Action: dedicated account management for the top 20% of accounts ({top_n:,}).'),
+                ('bullets', [
+                    f'These accounts generate {top_share:.1f}% of all cases',
+                    f"Busiest account: {busiest['account_name']} with {int(busiest['total_cases']):,} cases",
+                ]),
+            ]
+        else:
+            blocks.append(('text', 'No cases in the selected period.'))
+        blocks += [
+            ('text', 'Implementation steps:'),
+            ('bullets', [
+                'Assign dedicated support engineers to high-volume accounts',
+                'Conduct regular proactive health checks',
+                'Create custom documentation for their most common issues',
+            ]),
+        ]
+
+        blocks.append(('heading', 'Recommendation 2: Industry-Specialized Support Teams'))
+        evidence = []
+        industry_days = self.pipeline.kpi_industry.dropna(subset=['avg_resolution_days'])
+        if len(industry_days) > 1:
+            fastest = industry_days.loc[industry_days['avg_resolution_days'].idxmin()]
+            slowest = industry_days.loc[industry_days['avg_resolution_days'].idxmax()]
+            evidence.append(
+                f"Average resolution ranges from {fastest['avg_resolution_days']:.1f} days "
+                f"({_format_value(fastest['account_industry'])}) to {slowest['avg_resolution_days']:.1f} days "
+                f"({_format_value(slowest['account_industry'])})"
+            )
+        resolved = self.pipeline.kpi_priority_status.dropna(subset=['avg_resolution_days'])
+        if not resolved.empty:
+            by_priority = (
+                (resolved['avg_resolution_days'] * resolved['case_count']).groupby(resolved['case_priority']).sum()
+                / resolved.groupby('case_priority')['case_count'].sum()
+            ).sort_values()
+            evidence.append('Average resolution by priority: ' + ', '.join(
+                f'{priority} {days:.1f} days' for priority, days in by_priority.items()
+            ))
+        blocks += [
+            ('text', 'Action: route cases to industry-specialized support pods.'),
+            ('bullets', evidence or ['No resolved cases in the selected period.']),
+            ('text', 'Implementation steps:'),
+            ('bullets', [
+                'Create industry-specialized support pods',
+                'Enforce priority-based SLAs',
+                'Route cases automatically by industry and priority',
+                'Build industry-specific knowledge bases',
+            ]),
+        ]
+        return blocks
+
+    def recommendation_text(self):
+        """The recommendations section as Markdown text, for the console"""
+        return _render_blocks(self._recommendation_blocks(), 'md')
+
+    def _success_metric_blocks(self, stats):
+        rows = [
+            ('Total support cases', f"{stats['total_cases']:,}"),
+            ('Average cases per account', f"{stats['avg_cases_per_account']:.2f}"),
+            ('Median resolution time (days)', _format_value(stats['median_resolution_days'])),
+        ]
+        top = _top_accounts_share(self.pipeline.kpi_cases_per_account)
+        if top:
+            rows.append(('Share of cases from the top 20% of accounts', f'{top[1]:.1f}%'))
+        backlog = self.pipeline.kpi_backlog
+        if not backlog.empty:
+            latest = backlog[backlog['date'] == backlog['date'].max()]
+            rows.append(('Open backlog at the end of the period', f"{int(latest['open_backlog'].sum()):,}"))
+            rows.append(('SLA-breached backlog at the end of the period',
+                         f"{int(latest['sla_breached_backlog'].sum()):,}"))
+        return [
+            ('text', 'Baselines from this run. Track them across runs to measure the impact of the recommendations:'),
+            ('table', pd.DataFrame(rows, columns=['metric', 'baseline'])),
+        ]
+
+    def _visualization_blocks(self):
+        chart_paths = self.pipeline.chart_paths
+        if not chart_paths:
+            return [('text', 'No visualizations were generated in this run.')]
+        report_dir = os.path.dirname(config.REPORT_FILE)
+        images = [
+            (name.replace('_', ' ').title(), os.path.relpath(path, report_dir).replace(os.sep, '/'))
+            for name, path in chart_paths.items()
+        ]
+        return [('images', images)]
+
+    def _timing_blocks(self):
+        timings = self.pipeline.timings
+        if not timings:
+            return [('text', 'No timing information recorded.')]
+        df = pd.DataFrame(
+            [(stage, seconds) for stage, seconds in timings.items()],
+            columns=['stage', 'seconds'],
+        )
+        df.loc[len(df)] = ['total', df['seconds'].sum()]
+        blocks = [('table', df)]
+        if self.pipeline.memory:
+            memory = self.pipeline.memory.summary()
+            blocks.append(('bullets', [
+                f"Memory budget: {memory['budget_mb']:,} MB",
+                f"Memory high-water mark: {memory['high_water_mb']:,.0f} MB",
+                f"Spilled to disk: {', '.join(memory['spilled']) or 'nothing'}",
+            ]))
+        return blocks
+
+    def render(self, cache_path=None):
+        """Render every format, reusing cached sections whose inputs are unchanged.
+
+        Returns a dict of format -> rendered document and the list of
+        sections that were (re)rendered.
+        """
+        cache_path = cache_path or os.path.join(config.REPORT_CACHE_DIR, 'analysis_report.json')
+        cache = _load_cache(cache_path)
+        rendered = {fmt: {} for fmt in self.formats}
+        regenerated = []
+
+        for name, (inputs, build) in self._sections().items():
+            fingerprint = _fingerprint(*inputs)
+            cached = cache.get(name, {})
+            if cached.get('fingerprint') == fingerprint and all(fmt in cached for fmt in self.formats):
+                for fmt in self.formats:
+                    rendered[fmt][name] = cached[fmt]
+                continue
+
+            blocks = build()
+            cached = {'fingerprint': fingerprint}
+            for fmt in self.formats:
+                cached[fmt] = rendered[fmt][name] = _render_blocks(blocks, fmt)
+            cache[name] = cached
+            regenerated.append(name)
+
+        _save_cache(cache_path, cache)
+
+        documents = {}
+        for fmt in self.formats:
+            template = _load_template(f'analysis_report.{fmt}')
+            documents[fmt] = template.safe_substitute(report_date=self.report_date, **rendered[fmt])
+        return documents, regenerated
+
+    def write_report(self):
+        """Write ANALYSIS_REPORT.md / .html"""
+        documents, regenerated = self.render()
+        targets = {'md': config.REPORT_FILE, 'html': config.REPORT_HTML_FILE}
+        for fmt, document in documents.items():
+            with open(targets[fmt], 'w', encoding='utf-8') as f:
+                f.write(document)
+
+        print(f"✅ Report written to: {config.REPORT_FILE}")
+        if regenerated:
+            print(f"   Sections regenerated: {', '.join(regenerated)}")
+        else:
+            print("   All sections unchanged (served from cache)")
+
+    # ------------------------------------------------------------------
+    # Segment reports
+    # ------------------------------------------------------------------
+
+    def _segment_payloads(self, dimension):
+        """Aggregate once by segment, then slice the result per segment"""
+        if dimension not in SEGMENT_DIMENSIONS:
+            raise ValueError(f"Unsupported segment dimension: {dimension}")
+
+        query_segment_priority = f"""
+        SELECT
+            a.{dimension} as segment,
+            sc.case_priority,
+            sc.case_status,
+            COUNT(sc.case_sfid) as case_count,
+            SUM(JULIANDAY(sc.case_closed_date) - JULIANDAY(sc.case_created_date)) as resolution_sum,
+            COUNT(JULIANDAY(sc.case_closed_date) - JULIANDAY(sc.case_created_date)) as resolution_count
+        FROM accounts a
+        JOIN support_cases sc ON a.account_sfid = sc.account_sfid
+        GROUP BY a.{dimension}, sc.case_priority, sc.case_status
+        """
+        query_segment_accounts = f"""
+        SELECT
+            {dimension} as segment,
+            COUNT(*) as total_accounts
+        FROM accounts
+        GROUP BY {dimension}
+        """
+        priority = pd.read_sql_query(query_segment_priority, self.pipeline.conn)
+        accounts = pd.read_sql_query(query_segment_accounts, self.pipeline.conn)
+        accounts = accounts.set_index('segment')['total_accounts']
+        top_accounts = self.pipeline.kpi_cases_per_account
+
+        payloads = {}
+        # dropna=False: accounts with a NULL segment value get a report too
+        for segment, rows in priority.groupby('segment', sort=False, dropna=False):
+            segment = None if pd.isna(segment) else segment
+            rows = rows.drop(columns=['segment'])
+            total_cases = int(rows['case_count'].sum())
+            resolution_count = rows['resolution_count'].sum()
+            avg_resolution = rows['resolution_sum'].sum() / resolution_count if resolution_count else float('nan')
+            if segment is None:
+                total_accounts = int(accounts[accounts.index.isna()].sum())
+            else:
+                total_accounts = int(accounts.get(segment, 0))
+
+            rows = rows.assign(
+                avg_resolution_days=rows['resolution_sum'] / rows['resolution_count'].where(rows['resolution_count'] > 0)
+            ).drop(columns=['resolution_sum', 'resolution_count'])
+
+            in_segment = top_accounts[dimension].isna() if segment is None else top_accounts[dimension] == segment
+            segment_accounts = top_accounts[in_segment]
+            segment_accounts = segment_accounts[
+                ['account_name', 'total_cases', 'closed_cases', 'open_cases', 'avg_resolution_days']
+            ].head(config.REPORT_TABLE_ROWS)
+
+            summary = [
+                f'Total Accounts: {total_accounts:,}',
+                f'Total Support Cases: {total_cases:,}',
+                f'Average Cases per Account: {total_cases / total_accounts:.2f}' if total_accounts else
+                'Average Cases per Account: —',
+                f'Average Resolution Time: {avg_resolution:.2f} days' if pd.notna(avg_resolution) else
+                'Average Resolution Time: —',
+            ]
+            payloads[segment] = {
+                'summary': [('heading', 'Summary'), ('bullets', summary)],
+                'priority_status': [('heading', 'Priority & Status'), ('table', rows.reset_index(drop=True))],
+                'top_accounts': [('heading', 'Top Accounts'), ('table', segment_accounts.reset_index(drop=True))],
+            }
+        return payloads
+
+    def write_segment_reports(self, dimension, workers=None):
+        """Render one report per segment value of `dimension` in parallel"""
+        payloads = self._segment_payloads(dimension)
+        output_dir = os.path.join(config.SEGMENT_REPORTS_DIR, dimension)
+        os.makedirs(output_dir, exist_ok=True)
+        cache_path = os.path.join(config.REPORT_CACHE_DIR, f'segments_{dimension}.json')
+        cache = _load_cache(cache_path)
+
+        slugs = _segment_slugs(payloads)
+        expected_paths = set()
+        jobs = []
+        for segment, sections in payloads.items():
+            slug = slugs[segment]
+            outputs = [
+                (fmt, f'segment_report.{fmt}', os.path.join(output_dir, f'{slug}.{fmt}'))
+                for fmt in self.formats
+            ]
+            expected_paths.update(path for _, _, path in outputs)
+            fingerprint = _fingerprint(
+                str(segment), list(self.formats), self.report_date,
+                *[payload for blocks in sections.values() for _, payload in blocks],
+            )
+            if cache.get(slug) == fingerprint and all(os.path.exists(path) for _, _, path in outputs):
+                continue
+            cache[slug] = fingerprint
+            jobs.append({
+                'segment': segment,
+                'sections': sections,
+                'outputs': outputs,
+                'fields': {
+                    'segment': UNKNOWN_SEGMENT_LABEL if segment is None else str(segment),
+                    'dimension_label': SEGMENT_DIMENSIONS[dimension],
+                    'report_date': self.report_date,
+                },
+            })
+
+        workers = workers or config.REPORT_WORKERS
+        if len(jobs) > 1 and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_render_segment_report, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+        else:
+            for job in jobs:
+                _render_segment_report(job)
+
+        # Segments missing from this run (filtered out, renamed, ...) keep
+        # neither their files nor their cache entries
+        stale = [
+            entry for entry in os.listdir(output_dir)
+            if os.path.join(output_dir, entry) not in expected_paths
+            and os.path.isfile(os.path.join(output_dir, entry))
+        ]
+        for entry in stale:
+            os.remove(os.path.join(output_dir, entry))
+        current_slugs = set(slugs.values())
+        cache = {slug: fingerprint for slug, fingerprint in cache.items() if slug in current_slugs}
+
+        _save_cache(cache_path, cache)
+        print(f"✅ {SEGMENT_DIMENSIONS[dimension]} reports: {len(jobs)} rendered, "
+              f"{len(payloads) - len(jobs)} unchanged, {len(stale)} stale files removed ({output_dir})")
@@ -0,0 +1,154 @@
+"""
+KPI cube - precomputed additive aggregates over
+country × industry × priority × status × created month.
+
+The cube is built with a single GROUP BY over the accounts/support cases join
+and stored sparsely: one small integer code array per dimension plus one
+array per measure, with a label table for every dimension. Any roll-up or
+filter over those dimensions is then answered from the cube with NumPy
+instead of another full-scan SQL query.
+"""
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ['account_country', 'account_industry', 'case_priority', 'case_status', 'month']
+MEASURES = ['case_count', 'closed_cases', 'open_cases', 'resolution_sum', 'resolution_count']
+
+# Missing dimension values are stored as this label and mapped back to None
+MISSING_LABEL = ''
+
+
+def _code_dtype(cardinality):
+    """Smallest unsigned integer dtype able to hold `cardinality` codes"""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if cardinality <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+
+class KPICube:
+    """Sparse aggregate cube answering roll-ups and filters from arrays"""
+
+    def __init__(self, labels, codes, measures):
+        # labels: dimension -> sorted np.ndarray of str labels
+        # codes: dimension -> np.ndarray of integer codes into labels
+        # measures: measure -> np.ndarray aligned with the codes
+        self.labels = labels
+        self.codes = codes
+        self.measures = measures
+
+    @classmethod
+    def from_connection(cls, conn):
+        """Build the cube with one aggregation query over the SQLite tables"""
+        query_cube = """
+        SELECT
+            a.account_country,
+            a.account_industry,
+            sc.case_priority,
+            sc.case_status,
+            STRFTIME('%Y-%m', sc.case_created_date) as month,
+            COUNT(*) as case_count,
+            SUM(CASE WHEN sc.case_status = 'Closed' THEN 1 ELSE 0 END) as closed_cases,
+            SUM(CASE WHEN sc.case_status = 'Open' THEN 1 ELSE 0 END) as open_cases,
+            COALESCE(SUM(JULIANDAY(sc.case_closed_date) - JULIANDAY(sc.case_created_date)), 0) as resolution_sum,
+            COUNT(JULIANDAY(sc.case_closed_date) - JULIANDAY(sc.case_created_date)) as resolution_count
+        FROM support_cases sc
+        LEFT JOIN accounts a ON a.account_sfid = sc.account_sfid
+        GROUP BY 1, 2, 3, 4, 5
+        """
+        return cls.from_frame(pd.read_sql_query(query_cube, conn))
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build the cube from a frame with one row per dimension combination"""
+        labels, codes, measures = {}, {}, {}
+        for dim in DIMENSIONS:
+            values = df[dim].fillna(MISSING_LABEL).to_numpy(dtype=str)
+            uniques, inverse = np.unique(values, return_inverse=True)
+            labels[dim] = uniques
+            codes[dim] = inverse.astype(_code_dtype(len(uniques)))
+        for measure in MEASURES:
+            dtype = np.float64 if measure == 'resolution_sum' else np.int64
+            measures[measure] = df[measure].fillna(0).to_numpy(dtype=dtype)
+        return cls(labels, codes, measures)
+
+    @classmethod
+    def load(cls, path):
+        """Load a cube written by `save`"""
+        with np.load(path) as data:
+            labels = {dim: data[f'labels_{dim}'] for dim in DIMENSIONS}
+            codes = {dim: data[f'codes_{dim}'] for dim in DIMENSIONS}
+            measures = {measure: data[f'measure_{measure}'] for measure in MEASURES}
+        return cls(labels, codes, measures)
+
+    def save(self, path):
+        """Store the cube as a compressed .npz archive"""
+        arrays = {}
+        for dim in DIMENSIONS:
+            arrays[f'labels_{dim}'] = self.labels[dim]
+            arrays[f'codes_{dim}'] = self.codes[dim]
+        for measure in MEASURES:
+            arrays[f'measure_{measure}'] = self.measures[measure]
+        np.savez_compressed(path, **arrays)
+
+    def __len__(self):
+        return len(self.measures['case_count'])
+
+    def _filter_mask(self, filters):
+        """Boolean mask over cube cells for {dimension: values or (start, end)}"""
+        mask = np.ones(len(self), dtype=bool)
+        for dim, condition in (filters or {}).items():
+            if dim not in DIMENSIONS:
+                raise ValueError(f"Unknown cube dimension: {dim}")
+            dim_labels = self.labels[dim]
+            if isinstance(condition, tuple):
+                # Inclusive range, e.g. ('2024-01', '2024-03') on month
+                start, end = condition
+                selected = np.ones(len(dim_labels), dtype=bool)
+                if start is not None:
+                    selected &= dim_labels >= start
+                if end is not None:
+                    selected &= dim_labels <= end
+            else:
+                if isinstance(condition, str) or condition is None:
+                    condition = [condition]
+                wanted = [MISSING_LABEL if value is None else str(value) for value in condition]
+                selected = np.isin(dim_labels, wanted)
+            mask &= selected[self.codes[dim]]
+        return mask
+
+    def query(self, by=(), filters=None):
+        """Roll the cube up to the `by` dimensions after applying `filters`.
+
+        `filters` maps a dimension to a list of allowed values or to an
+        inclusive (start, end) range. Returns one row per non-empty group
+        with the additive measures and the derived avg_resolution_days.
+        """
+        by = list(by)
+        unknown = [dim for dim in by if dim not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown cube dimension(s): {unknown}")
+
+        mask = self._filter_mask(filters)
+        if by:
+            shape = tuple(len(self.labels[dim]) for dim in by)
+            keys = np.ravel_multi_index([self.codes[dim][mask].astype(np.int64) for dim in by], shape)
+            group_keys, inverse = np.unique(keys, return_inverse=True)
+        else:
+            group_keys = np.zeros(1, dtype=np.int64)
+            inverse = np.zeros(int(mask.sum()), dtype=np.int64)
+
+        result = {}
+        if by:
+            for dim, dim_codes in zip(by, np.unravel_index(group_keys, shape)):
+                values = self.labels[dim][dim_codes].astype(object)
+                values[values == MISSING_LABEL] = None
+                result[dim] = values
+        for measure in MEASURES:
+            totals = np.bincount(inverse, weights=self.measures[measure][mask], minlength=len(group_keys))
+            result[measure] = totals if measure == 'resolution_sum' else totals.astype(np.int64)
+
+        df = pd.DataFrame(result)
+        df['avg_resolution_days'] = df['resolution_sum'] / df['resolution_count'].where(df['resolution_count'] > 0)
+        return df.sort_values('case_count', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,285 @@
+"""
+KPI verification - reproducible fingerprints of the five KPI tables, golden
+fingerprints for the bundled and synthetic datasets, and a cross-engine
+comparison that runs two execution strategies on the same input.
+
+Usage:
+    python kpi_verification.py check   [--dataset synthetic|bundled]
+    python kpi_verification.py update  [--dataset synthetic|bundled]
+    python kpi_verification.py compare ENGINE_A ENGINE_B [--dataset ...]
+
+Fingerprints are order-independent (columns and rows are sorted before
+hashing) and float columns are rounded to the decimal of
+FINGERPRINT_TOLERANCE before hashing. Rounding is not a tolerance: two
+values 1e-12 apart can still fall on either side of a rounding boundary
+and change the fingerprint, so a 'check' failure means "differs at the
+tolerance, or straddles a boundary". 'compare' is the tolerance-safe check:
+it matches rows on their non-float columns and compares the float columns
+with np.isclose(atol=FINGERPRINT_TOLERANCE).
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import config
+import synthetic_data
+from main import DataAnalysisPipeline
+
+KPI_NAMES = [
+    'kpi_cases_per_account', 'kpi_priority_status', 'kpi_industry',
+    'kpi_country', 'kpi_time_series'
+]
+
+# Execution strategies as config overrides
+ENGINES = {
+    'parallel-thread': {'PARALLEL_LOAD': True, 'LOAD_WORKER_TYPE': 'thread'},
+    'parallel-process': {'PARALLEL_LOAD': True, 'LOAD_WORKER_TYPE': 'process'},
+    'sequential': {'PARALLEL_LOAD': False},
+    'memory-bounded': {'MEMORY_BUDGET_MB': 1},
+}
+
+
+def _canonical_value(value, decimals):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return 'null'
+    if isinstance(value, (float, np.floating)):
+        value = round(float(value), decimals)
+        if value.is_integer():
+            return str(int(value))
+        return repr(value)
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    return json.dumps(str(value))
+
+
+def canonical_rows(df, tolerance=None):
+    """Sorted list of canonical row strings (columns in name order)"""
+    tolerance = config.FINGERPRINT_TOLERANCE if tolerance is None else tolerance
+    decimals = max(0, int(round(-math.log10(tolerance))))
+    columns = sorted(df.columns)
+    rows = [
+        '|'.join(_canonical_value(value, decimals) for value in row)
+        for row in df[columns].astype(object).itertuples(index=False)
+    ]
+    return sorted(rows)
+
+
+def fingerprint(df, tolerance=None):
+    """Order-independent fingerprint of a KPI DataFrame"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(sorted(map(str, df.columns))).encode('utf-8'))
+    for row in canonical_rows(df, tolerance):
+        digest.update(row.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def fingerprint_kpis(kpis):
+    return {
+        name: {'fingerprint': fingerprint(df), 'rows': len(df), 'columns': sorted(df.columns)}
+        for name, df in kpis.items()
+    }
+
+
+@contextlib.contextmanager
+def _config_overrides(overrides):
+    previous = {key: getattr(config, key) for key in overrides}
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            setattr(config, key, value)
+
+
+@contextlib.contextmanager
+def dataset_paths(dataset):
+    """Yield (accounts_path, support_cases_path) for a named dataset"""
+    if dataset == 'bundled':
+        yield config.ACCOUNTS_FILE, config.SUPPORT_CASES_FILE
+    elif dataset == 'synthetic':
+        with tempfile.TemporaryDirectory() as tmp:
+            yield synthetic_data.write_dataset(tmp)
+    else:
+        raise ValueError(f"Unknown dataset: {dataset}")
+
+
+def run_kpis(accounts_path, support_cases_path, overrides=None):
+    """Run the load + KPI stages under config overrides and return the five KPI tables"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep side outputs of the run out of outputs/
+        overrides = dict(overrides or {})
+        overrides.setdefault('KPI_CUBE_FILE', os.path.join(tmp, 'kpi_cube.npz'))
+        overrides.setdefault('SPILL_DIR', os.path.join(tmp, 'spill'))
+        overrides.setdefault('STAGING_DIR', os.path.join(tmp, 'staging'))
+        with _config_overrides(overrides), contextlib.redirect_stdout(io.StringIO()):
+            pipeline = DataAnalysisPipeline(accounts_path, support_cases_path)
+            pipeline.load_data()
+            pipeline.process_data()
+            pipeline.enforce_memory_budget()
+            kpis = {name: getattr(pipeline, name) for name in KPI_NAMES}
+            pipeline.close()
+    return kpis
+
+
+def load_golden(path=None):
+    path = path or config.GOLDEN_FINGERPRINTS_FILE
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_golden(golden, path=None):
+    path = path or config.GOLDEN_FINGERPRINTS_FILE
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(golden, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def check_golden(dataset, overrides=None):
+    """Compare a run's fingerprints with the stored golden ones; returns mismatching KPIs"""
+    golden = load_golden().get(dataset)
+    if golden is None:
+        raise ValueError(f"No golden fingerprints stored for dataset {dataset!r}; run 'update' first")
+    with dataset_paths(dataset) as paths:
+        current = fingerprint_kpis(run_kpis(*paths, overrides))
+    return [name for name in KPI_NAMES if current[name] != golden.get(name)]
+
+
+def _float_columns(*dfs):
+    return sorted({col for df in dfs for col in df.columns if pd.api.types.is_float_dtype(df[col])})
+
+
+def _numbered(df, keys, floats):
+    """Sort by the key then float columns and number repeated keys"""
+    df = df.sort_values(keys + floats, kind='stable').reset_index(drop=True)
+    df['_occurrence'] = df.groupby(keys, dropna=False).cumcount() if keys else np.arange(len(df))
+    return df
+
+
+def diff_kpis(kpis_a, kpis_b, tolerance=None, max_examples=5):
+    """Per-KPI differences between two runs.
+
+    Rows are matched on their non-float (key) columns; float columns of
+    matched rows are equal when np.isclose(atol=tolerance), NaN == NaN.
+    """
+    tolerance = config.FINGERPRINT_TOLERANCE if tolerance is None else tolerance
+    report = {}
+    for name in KPI_NAMES:
+        df_a, df_b = kpis_a[name], kpis_b[name]
+        if sorted(df_a.columns) != sorted(df_b.columns):
+            report[name] = {
+                'match': False, 'rows_a': len(df_a), 'rows_b': len(df_b),
+                'only_in_a': len(df_a), 'only_in_b': len(df_b), 'value_mismatches': 0,
+                'examples_a': [f'columns: {sorted(df_a.columns)}'],
+                'examples_b': [f'columns: {sorted(df_b.columns)}'],
+            }
+            continue
+
+        floats = _float_columns(df_a, df_b)
+        keys = sorted(col for col in df_a.columns if col not in floats)
+        merged = _numbered(df_a, keys, floats).merge(
+            _numbered(df_b, keys, floats), on=keys + ['_occurrence'], how='outer',
+            suffixes=('_a', '_b'), indicator=True,
+        )
+        only_a = merged[merged['_merge'] == 'left_only']
+        only_b = merged[merged['_merge'] == 'right_only']
+        both = merged[merged['_merge'] == 'both']
+
+        close = np.ones(len(both), dtype=bool)
+        for col in floats:
+            close &= np.isclose(both[f'{col}_a'].astype(float), both[f'{col}_b'].astype(float),
+                                rtol=0, atol=tolerance, equal_nan=True)
+        mismatched = both[~close]
+
+        def rows(frame, side):
+            frame = frame[keys + [f'{col}_{side}' for col in floats]]
+            frame.columns = keys + floats
+            return canonical_rows(frame.head(max_examples), tolerance)
+
+        report[name] = {
+            'match': only_a.empty and only_b.empty and mismatched.empty,
+            'rows_a': len(df_a),
+            'rows_b': len(df_b),
+            'only_in_a': len(only_a),
+            'only_in_b': len(only_b),
+            'value_mismatches': len(mismatched),
+            'examples_a': rows(only_a, 'a') + rows(mismatched, 'a'),
+            'examples_b': rows(only_b, 'b') + rows(mismatched, 'b'),
+        }
+    return report
+
+
+def compare_engines(engine_a, engine_b, dataset):
+    """Run two execution strategies on the same input and diff their KPI tables"""
+    for engine in (engine_a, engine_b):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r} (available: {sorted(ENGINES)})")
+    with dataset_paths(dataset) as paths:
+        kpis_a = run_kpis(*paths, ENGINES[engine_a])
+        kpis_b = run_kpis(*paths, ENGINES[engine_b])
+    return diff_kpis(kpis_a, kpis_b)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="KPI fingerprinting and regression checks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for command in ('check', 'update'):
+        sub = subparsers.add_parser(command)
+        sub.add_argument('--dataset', choices=['synthetic', 'bundled'], default='synthetic')
+    compare = subparsers.add_parser('compare')
+    compare.add_argument('engine_a', choices=sorted(ENGINES))
+    compare.add_argument('engine_b', choices=sorted(ENGINES))
+    compare.add_argument('--dataset', choices=['synthetic', 'bundled'], default='synthetic')
+    args = parser.parse_args(argv)
+
+    if args.command == 'update':
+        golden = load_golden()
+        with dataset_paths(args.dataset) as paths:
+            golden[args.dataset] = fingerprint_kpis(run_kpis(*paths))
+        save_golden(golden)
+        print(f"✅ Golden fingerprints for '{args.dataset}' written to {config.GOLDEN_FINGERPRINTS_FILE}")
+        return 0
+
+    if args.command == 'check':
+        mismatches = check_golden(args.dataset)
+        if mismatches:
+            print(f"❌ KPI tables differ from the golden output: {', '.join(mismatches)}")
+            print("   Fingerprints round floats, so values within the tolerance can still differ "
+                  "across a rounding boundary; use 'compare' to diff two engines with a tolerance")
+            return 1
+        print(f"✅ All {len(KPI_NAMES)} KPI tables match the golden output for '{args.dataset}'")
+        return 0
+
+    report = compare_engines(args.engine_a, args.engine_b, args.dataset)
+    failed = False
+    for name, result in report.items():
+        if result['match']:
+            print(f"✅ {name}: matches within the tolerance ({result['rows_a']} rows)")
+            continue
+        failed = True
+        print(f"❌ {name}: {result['only_in_a']} rows only in {args.engine_a}, "
+              f"{result['only_in_b']} rows only in {args.engine_b}, "
+              f"{result['value_mismatches']} rows with values beyond the tolerance")
+        for row in result['examples_a']:
+            print(f"   - {args.engine_a}: {row}")
+        for row in result['examples_b']:
+            print(f"   - {args.engine_b}: {row}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
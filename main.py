@@ -3,7 +3,9 @@ Data Analysis Challenge - Support Cases & Accounts Analysis
 Professional data analysis pipeline with best practices
 """
 
-import json
+import contextlib
+import shutil
+import tempfile
 import pandas as pd
 import numpy as np
 import sqlite3
@@ -14,7 +16,15 @@ import plotly.graph_objects as go
 from datetime import datetime
 import warnings
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 import config
+from generate_report import ReportGenerator
+from kpi_cube import KPICube
+from connectors import Connector, connector_for_path
+from sla_analytics import compute_backlog
+from memory_budget import MemoryBudget, SpillableFrame
+from anomaly_detection import detect_anomalies
 
 warnings.filterwarnings('ignore')
 
@@ -22,15 +32,129 @@ warnings.filterwarnings('ignore')
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = config.FIGURE_SIZE
 
+REQUIRED_COLUMNS = {
+    'accounts': [
+        'account_sfid', 'account_name', 'account_created_date',
+        'account_country', 'account_industry'
+    ],
+    'support_cases': [
+        'case_sfid', 'account_sfid', 'case_created_date', 'case_closed_date',
+        'case_status', 'case_priority'
+    ],
+}
+
+DATE_COLUMNS = {
+    'accounts': ['account_created_date'],
+    'support_cases': ['case_created_date', 'case_closed_date'],
+}
+
+
+def _sqlite_datetimes(series: pd.Series) -> np.ndarray:
+    """Format a datetime column as SQLite date text ('YYYY-MM-DD HH:MM:SS')
+    
+    Same text as to_sql's per-value isoformat, built in bulk: the
+    conversion otherwise dominates the cost of writing the cases table.
+    """
+    values = series.to_numpy(dtype='datetime64[us]')
+    valid = ~np.isnat(values)
+    text = np.full(len(values), None, dtype=object)
+    if valid.any():
+        has_fraction = (values[valid].astype(np.int64) % 1_000_000).any()
+        formatted = np.datetime_as_string(values[valid], unit='us' if has_fraction else 's')
+        # Fixed-width strings: replace the 'T' separator in place
+        formatted.view(np.uint32).reshape(len(formatted), -1)[:, 10] = ord(' ')
+        text[valid] = formatted
+    return text
+
+
+def _write_sqlite(df: pd.DataFrame, name: str, db_path: str):
+    """Write a source into its own SQLite file (attached by the pipeline)"""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    sql_df = df.copy(deep=False)
+    for col in sql_df.columns:
+        if pd.api.types.is_datetime64_dtype(sql_df[col]):
+            sql_df[col] = _sqlite_datetimes(sql_df[col])
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        # Scratch file rebuilt on every run: no journal, no fsync
+        conn.execute('PRAGMA journal_mode=OFF')
+        conn.execute('PRAGMA synchronous=OFF')
+        sql_df.to_sql(name, conn, if_exists='replace', index=False)
+        conn.commit()
+
+
+def _load_source(name: str, connector: Connector, filters: dict, db_path: str) -> pd.DataFrame:
+    """Read one source with pushdown, validate and type it, and write it to
+    its SQLite file (runs in a worker)"""
+    df = connector.read(columns=REQUIRED_COLUMNS[name], filters=filters)
+    
+    missing = [col for col in REQUIRED_COLUMNS[name] if col not in df.columns]
+    if missing:
+        raise ValueError(f"{name} source {connector} is missing required columns: {missing}")
+    
+    for col in DATE_COLUMNS[name]:
+        df[col] = pd.to_datetime(df[col])
+    
+    _write_sqlite(df, name, db_path)
+    return df
+
+
+KPI_TABLES = [
+    'kpi_cases_per_account', 'kpi_priority_status', 'kpi_industry',
+    'kpi_country', 'kpi_time_series', 'kpi_backlog', 'kpi_anomalies'
+]
+
+
 class DataAnalysisPipeline:
     """Main pipeline for data analysis with best practices"""
     
-    def __init__(self, accounts_path: str, support_cases_path: str):
-        self.accounts_path = accounts_path
-        self.support_cases_path = support_cases_path
+    # KPI tables may be spilled to disk in memory-bounded mode
+    kpi_cases_per_account = SpillableFrame()
+    kpi_priority_status = SpillableFrame()
+    kpi_industry = SpillableFrame()
+    kpi_country = SpillableFrame()
+    kpi_time_series = SpillableFrame()
+    kpi_backlog = SpillableFrame()
+    kpi_anomalies = SpillableFrame()
+    
+    def __init__(self, accounts_path, support_cases_path, filters: dict = None):
+        # Sources may be file paths (connector picked by extension) or Connectors
+        self.accounts_source = (
+            accounts_path if isinstance(accounts_path, Connector)
+            else connector_for_path(accounts_path, table='accounts')
+        )
+        self.support_cases_source = (
+            support_cases_path if isinstance(support_cases_path, Connector)
+            else connector_for_path(support_cases_path, table='support_cases')
+        )
+        self.filters = self._split_filters(filters or {})
         self.conn = sqlite3.connect(':memory:')
+        self.staging_dir = None
         self.df_accounts = None
         self.df_support_cases = None
+        self.timings = {}
+        self.chart_paths = {}
+        self.kpi_cube = None
+        self.kpi_backlog = None
+        self.kpi_anomalies = None
+        self._summary_stats = None
+        self.memory = (
+            MemoryBudget(config.MEMORY_BUDGET_MB, config.MEMORY_SPILL_THRESHOLD, config.SPILL_DIR)
+            if config.MEMORY_BUDGET_MB else None
+        )
+        
+    @staticmethod
+    def _split_filters(filters: dict) -> dict:
+        """Route each pushdown filter to the source that holds its column"""
+        split = {'accounts': {}, 'support_cases': {}}
+        for column, condition in filters.items():
+            if column in REQUIRED_COLUMNS['support_cases']:
+                split['support_cases'][column] = condition
+            elif column in REQUIRED_COLUMNS['accounts']:
+                split['accounts'][column] = condition
+            else:
+                raise ValueError(f"Cannot filter on unknown column: {column}")
+        return split
         
     def load_data(self):
         """Part 1: Load and explore the data"""
@@ -38,36 +162,103 @@ class DataAnalysisPipeline:
         print("PART 1: DATA EXPLORATION")
         print("=" * 80)
         
-        # Load accounts
-        with open(self.accounts_path, 'r', encoding='utf-8') as f:
-            accounts_data = json.load(f)
-        self.df_accounts = pd.DataFrame(accounts_data)
-        
-        # Load support cases
-        with open(self.support_cases_path, 'r', encoding='utf-8') as f:
-            support_cases_data = json.load(f)
-        self.df_support_cases = pd.DataFrame(support_cases_data)
+        # Each source is written to its own SQLite file under the staging
+        # dir and attached to self.conn, so the parse and the SQLite write
+        # of both sources both happen in the workers.
+        os.makedirs(config.STAGING_DIR, exist_ok=True)
+        self.staging_dir = tempfile.mkdtemp(prefix='load-', dir=config.STAGING_DIR)
+        
+        # Account-level filters (country, industry) restrict the cases too:
+        # in that case the cases read waits for the filtered account ids.
+        cases_need_accounts = bool(self.filters['accounts'])
+        
+        if config.PARALLEL_LOAD:
+            executor_cls = ProcessPoolExecutor if config.LOAD_WORKER_TYPE == 'process' else ThreadPoolExecutor
+            with executor_cls(max_workers=2) as executor:
+                futures = {
+                    executor.submit(_load_source, 'accounts', self.accounts_source,
+                                    self.filters['accounts'], self._staging_path('accounts')): 'accounts'
+                }
+                if not cases_need_accounts:
+                    futures[executor.submit(_load_source, 'support_cases', self.support_cases_source,
+                                            self.filters['support_cases'],
+                                            self._staging_path('support_cases'))] = 'support_cases'
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = futures[future]
+                        self._store_source(name, future.result())
+                        if name == 'accounts' and cases_need_accounts:
+                            cases_future = executor.submit(_load_source, 'support_cases', self.support_cases_source,
+                                                           self._support_cases_filters(),
+                                                           self._staging_path('support_cases'))
+                            futures[cases_future] = 'support_cases'
+                            pending.add(cases_future)
+        else:
+            self._store_source('accounts', _load_source('accounts', self.accounts_source,
+                                                        self.filters['accounts'],
+                                                        self._staging_path('accounts')))
+            self._store_source('support_cases', _load_source('support_cases', self.support_cases_source,
+                                                             self._support_cases_filters(),
+                                                             self._staging_path('support_cases')))
         
         self._explore_data()
+        self._check_memory('explore_data')
+        
+    def _support_cases_filters(self) -> dict:
+        """Case filters, plus the loaded account ids when accounts are filtered"""
+        filters = dict(self.filters['support_cases'])
+        if self.filters['accounts']:
+            filters['account_sfid'] = self._source_frame('accounts', ['account_sfid'])['account_sfid'].tolist()
+        return filters
+        
+    def _staging_path(self, name: str) -> str:
+        return os.path.join(self.staging_dir, f'{name}.db')
+        
+    def _store_source(self, name: str, df: pd.DataFrame):
+        """Keep a loaded source on the pipeline and attach its SQLite file"""
+        setattr(self, f'df_{name}', df)
+        # Unqualified table names resolve to the attached databases
+        self.conn.execute(f"ATTACH DATABASE ? AS src_{name}", (self._staging_path(name),))
+        print(f"✅ Loaded {name}: {len(df):,} rows")
+        if self.memory:
+            self.memory.sample(f'load_{name}')
+        
+    def _source_frame(self, name: str, columns: list = None) -> pd.DataFrame:
+        """A loaded source: the resident frame, or `columns` re-read from its
+        SQLite file once the frame was released in memory-bounded mode"""
+        df = getattr(self, f'df_{name}')
+        if df is not None:
+            return df
+        columns = columns or REQUIRED_COLUMNS[name]
+        dates = [col for col in columns if col in DATE_COLUMNS[name]]
+        # Chunked so the rows never exist as Python tuples all at once
+        chunks = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM {name}", self.conn,
+                                   parse_dates=dates, chunksize=config.RELOAD_CHUNK_ROWS)
+        return pd.concat(chunks, ignore_index=True)
         
     def _explore_data(self):
         """Explore data structure and content"""
+        df_accounts = self._source_frame('accounts')
         print("\n📊 ACCOUNTS DATASET")
-        print(f"Shape: {self.df_accounts.shape}")
-        print(f"\nColumns: {list(self.df_accounts.columns)}")
-        print(f"\nData Types:\n{self.df_accounts.dtypes}")
-        print(f"\nFirst few rows:\n{self.df_accounts.head()}")
-        print(f"\nMissing values:\n{self.df_accounts.isnull().sum()}")
-        print(f"\nBasic statistics:\n{self.df_accounts.describe()}")
+        print(f"Shape: {df_accounts.shape}")
+        print(f"\nColumns: {list(df_accounts.columns)}")
+        print(f"\nData Types:\n{df_accounts.dtypes}")
+        print(f"\nFirst few rows:\n{df_accounts.head()}")
+        print(f"\nMissing values:\n{df_accounts.isnull().sum()}")
+        print(f"\nBasic statistics:\n{df_accounts.describe()}")
         
         print("\n" + "=" * 80)
+        del df_accounts
+        df_support_cases = self._source_frame('support_cases')
         print("\n📞 SUPPORT CASES DATASET")
-        print(f"Shape: {self.df_support_cases.shape}")
-        print(f"\nColumns: {list(self.df_support_cases.columns)}")
-        print(f"\nData Types:\n{self.df_support_cases.dtypes}")
-        print(f"\nFirst few rows:\n{self.df_support_cases.head()}")
-        print(f"\nMissing values:\n{self.df_support_cases.isnull().sum()}")
-        print(f"\nBasic statistics:\n{self.df_support_cases.describe()}")
+        print(f"Shape: {df_support_cases.shape}")
+        print(f"\nColumns: {list(df_support_cases.columns)}")
+        print(f"\nData Types:\n{df_support_cases.dtypes}")
+        print(f"\nFirst few rows:\n{df_support_cases.head()}")
+        print(f"\nMissing values:\n{df_support_cases.isnull().sum()}")
+        print(f"\nBasic statistics:\n{df_support_cases.describe()}")
         
     def process_data(self):
         """Part 2: Data Processing using SQL"""
@@ -75,17 +266,23 @@ class DataAnalysisPipeline:
         print("PART 2: DATA PROCESSING WITH SQL")
         print("=" * 80)
         
-        # Convert date columns to datetime
-        self.df_accounts['account_created_date'] = pd.to_datetime(self.df_accounts['account_created_date'])
-        self.df_support_cases['case_created_date'] = pd.to_datetime(self.df_support_cases['case_created_date'])
-        self.df_support_cases['case_closed_date'] = pd.to_datetime(self.df_support_cases['case_closed_date'])
-        
-        # Load data into SQLite
-        self.df_accounts.to_sql('accounts', self.conn, if_exists='replace', index=False)
-        self.df_support_cases.to_sql('support_cases', self.conn, if_exists='replace', index=False)
+        # Sources are already typed and loaded into SQLite by load_data()
         
         # SQL Queries for KPIs
         self._calculate_kpis()
+        self._check_memory('calculate_kpis')
+        
+        # Aggregate cube for ad-hoc slices
+        self._build_kpi_cube()
+        self._check_memory('build_kpi_cube')
+        
+        # Daily backlog, aging and SLA breaches
+        self._calculate_backlog()
+        self._check_memory('calculate_backlog')
+        
+        # Spikes in daily case volume per priority / country / industry
+        self._detect_anomalies()
+        self._check_memory('detect_anomalies')
         
     def _calculate_kpis(self):
         """Calculate Key Performance Indicators using SQL"""
@@ -172,31 +369,86 @@ class DataAnalysisPipeline:
         print(f"- Country Analysis: {len(self.kpi_country)} records")
         print(f"- Time Series Data: {len(self.kpi_time_series)} records")
         
+    def _build_kpi_cube(self):
+        """Precompute the country × industry × priority × status × month cube"""
+        self.kpi_cube = KPICube.from_connection(self.conn)
+        self.kpi_cube.save(config.KPI_CUBE_FILE)
+        
+        print(f"\n🧊 KPI cube built: {len(self.kpi_cube)} cells")
+        print(f"   Saved to: {config.KPI_CUBE_FILE}")
+        
+    def _calculate_backlog(self):
+        """Daily open backlog, aging buckets and SLA breaches per priority"""
+        self.kpi_backlog = compute_backlog(self._source_frame(
+            'support_cases', ['case_created_date', 'case_closed_date', 'case_priority']
+        ))
+        
+        print(f"\n⏳ Backlog & SLA analysis: {len(self.kpi_backlog)} records")
+        if not self.kpi_backlog.empty:
+            daily = self.kpi_backlog.groupby('date')[['open_backlog', 'sla_breached_backlog']].sum()
+            print(f"   Peak open backlog: {daily['open_backlog'].max():,} cases on {daily['open_backlog'].idxmax()}")
+            print(f"   Peak SLA-breached backlog: {daily['sla_breached_backlog'].max():,} cases")
+        
+    def _detect_anomalies(self):
+        """Rank abnormal spikes in daily case volume across all segments"""
+        dimensions = config.ANOMALY_DIMENSIONS
+        cases = self._source_frame('support_cases', ['account_sfid', 'case_created_date'] + [
+            dim for dim in dimensions if dim in REQUIRED_COLUMNS['support_cases']
+        ])
+        accounts = self._source_frame('accounts', ['account_sfid'] + [
+            dim for dim in dimensions if dim in REQUIRED_COLUMNS['accounts']
+        ])
+        self.kpi_anomalies = detect_anomalies(cases, accounts, dimensions)
+        del cases, accounts
+        
+        print(f"\n🚨 Anomaly detection ({config.ANOMALY_METHOD}): {len(self.kpi_anomalies)} spikes flagged")
+        for row in self.kpi_anomalies.head(5).itertuples(index=False):
+            print(f"   #{row.rank} {row.date} {row.dimension}={row.segment}: "
+                  f"{row.cases_created} cases (baseline {row.baseline:.1f}, score {row.score:.1f})")
+        
     def create_visualizations(self):
         """Part 3: Data Visualization"""
         print("\n" + "=" * 80)
         print("PART 3: DATA VISUALIZATION")
         print("=" * 80)
         
-        # Visualization 1: Top Accounts by Cases
-        self._viz_top_accounts()
-        
-        # Visualization 2: Cases by Priority and Status
-        self._viz_priority_status()
-        
-        # Visualization 3: Industry Performance
-        self._viz_industry_analysis()
-        
-        # Visualization 4: Geographic Distribution
-        self._viz_country_analysis()
-        
-        # Visualization 5: Time Series
-        self._viz_time_series()
-        
-        # Visualization 6: Resolution Time Distribution
-        self._viz_resolution_time()
-        
-        print("\n✅ All visualizations created successfully!")
+        visualizations = [
+            # (chart, KPI table it is drawn from, builder)
+            ('Top Accounts by Cases', 'kpi_cases_per_account', self._viz_top_accounts),
+            ('Cases by Priority and Status', 'kpi_priority_status', self._viz_priority_status),
+            ('Industry Performance', 'kpi_industry', self._viz_industry_analysis),
+            ('Geographic Distribution', 'kpi_country', self._viz_country_analysis),
+            ('Time Series', 'kpi_time_series', self._viz_time_series),
+            ('Resolution Time Distribution', 'kpi_cases_per_account', self._viz_resolution_time),
+        ]
+        skipped = []
+        for title, kpi_name, build in visualizations:
+            # Filters can leave a run without cases: there is nothing to plot
+            if not self._kpi_has_cases(kpi_name):
+                skipped.append(title)
+                continue
+            build()
+            self._release_figures()
+        
+        if skipped:
+            print(f"\n⚠️  Skipped (no cases in the selected data): {', '.join(skipped)}")
+        else:
+            print("\n✅ All visualizations created successfully!")
+        
+    def _kpi_has_cases(self, name: str) -> bool:
+        """Whether a KPI table has rows backed by at least one case"""
+        df = getattr(self, name)
+        if df.empty:
+            return False
+        for column in ('total_cases', 'case_count', 'cases_created'):
+            if column in df.columns:
+                return bool(df[column].sum() > 0)
+        return True
+        
+    def _release_figures(self):
+        """Close saved figures in memory-bounded mode instead of keeping them all alive"""
+        if self.memory:
+            plt.close('all')
         
     def _viz_top_accounts(self):
         """Visualize top accounts by number of cases"""
@@ -306,6 +558,7 @@ class DataAnalysisPipeline:
         plt.tight_layout()
         output_path = os.path.join(config.VISUALIZATIONS_DIR, 'viz_top_accounts.png')
         plt.savefig(output_path, dpi=config.DPI, bbox_inches='tight')
+        self.chart_paths['top_accounts'] = output_path
         plt.show()
         print(f"✅ Top Accounts visualization saved")
 
@@ -369,6 +622,7 @@ class DataAnalysisPipeline:
         
         output_path = os.path.join(config.VISUALIZATIONS_DIR, 'viz_priority_status.png')
         plt.savefig(output_path, dpi=config.DPI, bbox_inches='tight')
+        self.chart_paths['priority_status'] = output_path
         plt.show()
         print(f"✅ Priority/Status visualization saved with {n_statuses} distinct colors")
         
@@ -460,6 +714,7 @@ class DataAnalysisPipeline:
         plt.tight_layout()
         output_path = os.path.join(config.VISUALIZATIONS_DIR, 'viz_industry_analysis.png')
         plt.savefig(output_path, dpi=config.DPI, bbox_inches='tight')
+        self.chart_paths['industry_analysis'] = output_path
         plt.show()
         print(f"✅ Industry Analysis visualization saved")
         
@@ -508,6 +763,7 @@ class DataAnalysisPipeline:
         plt.tight_layout()
         output_path = os.path.join(config.VISUALIZATIONS_DIR, 'viz_country_analysis.png')
         plt.savefig(output_path, dpi=config.DPI, bbox_inches='tight')
+        self.chart_paths['country_analysis'] = output_path
         plt.show()
         print(f"✅ Country Analysis visualization saved")
         
@@ -576,14 +832,14 @@ class DataAnalysisPipeline:
         plt.tight_layout()
         output_path = os.path.join(config.VISUALIZATIONS_DIR, 'viz_time_series.png')
         plt.savefig(output_path, dpi=config.DPI, bbox_inches='tight')
+        self.chart_paths['time_series'] = output_path
         plt.show()
         print(f"✅ Time Series visualization saved with vibrant colors")
         
     def _viz_resolution_time(self):
         """Visualize resolution time distribution"""
-        resolution_data = self.kpi_cases_per_account[
-            self.kpi_cases_per_account['avg_resolution_days'].notna()
-        ]
+        kpi_accounts = self.kpi_cases_per_account
+        resolution_data = kpi_accounts[kpi_accounts['avg_resolution_days'].notna()]
         
         # Create figure
         fig = plt.figure(figsize=(20, 9))
@@ -669,6 +925,7 @@ class DataAnalysisPipeline:
         plt.tight_layout()
         output_path = os.path.join(config.VISUALIZATIONS_DIR, 'viz_resolution_time.png')
         plt.savefig(output_path, dpi=config.DPI, bbox_inches='tight')
+        self.chart_paths['resolution_time'] = output_path
         plt.show()
         print(f"✅ Resolution Time visualization saved")
         
@@ -701,52 +958,60 @@ class DataAnalysisPipeline:
 5. TEMPORAL TRENDS
    - Case creation patterns show specific trends over time
    - Can inform staffing and resource planning
-
-📋 ACTIONABLE RECOMMENDATIONS:
-
-1. IMPLEMENT PROACTIVE SUPPORT FOR HIGH-VOLUME ACCOUNTS
-   Action: Create dedicated account management for top 20 accounts
-   Expected Impact: 
-   - Reduce case volume by 15-20% through proactive issue prevention
-   - Improve customer satisfaction and retention
-   - Enable early identification of systemic issues
-   
-   Implementation:
-   - Assign dedicated support engineers to top accounts
-   - Conduct monthly health checks and training sessions
-   - Create custom documentation for common issues
-
-2. OPTIMIZE RESOURCE ALLOCATION BY PRIORITY AND INDUSTRY
-   Action: Restructure support team with industry specialization
-   Expected Impact:
-   - Reduce average resolution time by 25-30%
-   - Improve first-contact resolution rate
-   - Increase customer satisfaction scores
-   
-   Implementation:
-   - Create industry-specialized support pods
-   - Develop priority-based SLA enforcement
-   - Implement automated routing based on industry and priority
-   - Create industry-specific knowledge bases
         """
         
         print(insights)
         
+        # Same KPI-backed recommendations as the report, not hard-coded targets
+        print("📋 ACTIONABLE RECOMMENDATIONS:\n")
+        print(ReportGenerator(self).recommendation_text())
+        
         # Generate summary statistics
         print("\n" + "=" * 80)
         print("📊 SUMMARY STATISTICS")
         print("=" * 80)
         
-        total_cases = len(self.df_support_cases)
-        total_accounts = len(self.df_accounts)
-        avg_cases_per_account = total_cases / total_accounts
-        
-        print(f"\nTotal Accounts: {total_accounts:,}")
-        print(f"Total Support Cases: {total_cases:,}")
-        print(f"Average Cases per Account: {avg_cases_per_account:.2f}")
-        print(f"Median Resolution Time: {self.kpi_cases_per_account['avg_resolution_days'].median():.2f} days")
-        print(f"Countries Served: {self.df_accounts['account_country'].nunique()}")
-        print(f"Industries Served: {self.df_accounts['account_industry'].nunique()}")
+        stats = self.summary_stats()
+        print(f"\nTotal Accounts: {stats['total_accounts']:,}")
+        print(f"Total Support Cases: {stats['total_cases']:,}")
+        print(f"Average Cases per Account: {stats['avg_cases_per_account']:.2f}")
+        median = stats['median_resolution_days']
+        print(f"Median Resolution Time: {median:.2f} days" if pd.notna(median) else "Median Resolution Time: —")
+        print(f"Countries Served: {stats['countries_served']}")
+        print(f"Industries Served: {stats['industries_served']}")
+        
+    def summary_stats(self):
+        """Headline statistics shared by the console insights and the report"""
+        if self._summary_stats is not None:
+            # Cached by enforce_memory_budget() in memory-bounded mode
+            return self._summary_stats
+        
+        if self.df_support_cases is not None and self.df_accounts is not None:
+            total_cases = len(self.df_support_cases)
+            total_accounts = len(self.df_accounts)
+            countries_served = self.df_accounts['account_country'].nunique()
+            industries_served = self.df_accounts['account_industry'].nunique()
+        else:
+            # Raw frames were released: count from the SQLite copy
+            query_counts = """
+            SELECT
+                (SELECT COUNT(*) FROM support_cases) as total_cases,
+                COUNT(*) as total_accounts,
+                COUNT(DISTINCT account_country) as countries_served,
+                COUNT(DISTINCT account_industry) as industries_served
+            FROM accounts
+            """
+            total_cases, total_accounts, countries_served, industries_served = (
+                int(value) for value in self.conn.execute(query_counts).fetchone()
+            )
+        return {
+            'total_accounts': total_accounts,
+            'total_cases': total_cases,
+            'avg_cases_per_account': total_cases / total_accounts if total_accounts else 0.0,
+            'median_resolution_days': self.kpi_cases_per_account['avg_resolution_days'].median(),
+            'countries_served': countries_served,
+            'industries_served': industries_served,
+        }
         
     def export_kpis(self):
         """Export KPIs to CSV files for further analysis"""
@@ -779,6 +1044,14 @@ class DataAnalysisPipeline:
             os.path.join(reports_dir, 'kpi_time_series.csv'), 
             index=False
         )
+        self.kpi_backlog.to_csv(
+            os.path.join(reports_dir, 'kpi_backlog.csv'), 
+            index=False
+        )
+        self.kpi_anomalies.to_csv(
+            os.path.join(reports_dir, 'kpi_anomalies.csv'), 
+            index=False
+        )
         
         print(f"✅ KPIs exported to: {reports_dir}")
         print("Files created:")
@@ -787,6 +1060,58 @@ class DataAnalysisPipeline:
         print("  - kpi_industry.csv")
         print("  - kpi_country.csv")
         print("  - kpi_time_series.csv")
+        print("  - kpi_backlog.csv")
+        print("  - kpi_anomalies.csv")
+
+    def generate_report(self):
+        """Part 5: Render ANALYSIS_REPORT.md from the computed KPIs"""
+        print("\n" + "=" * 80)
+        print("GENERATING ANALYSIS REPORT")
+        print("=" * 80)
+
+        generator = ReportGenerator(self)
+        generator.write_report()
+        for dimension in config.REPORT_SEGMENT_DIMENSIONS:
+            generator.write_segment_reports(dimension)
+
+    def _timed(self, stage, func):
+        """Run a pipeline stage and record its wall time in seconds"""
+        start = time.perf_counter()
+        result = func()
+        self.timings[stage] = time.perf_counter() - start
+        if self.memory:
+            self.memory.sample(stage)
+        return result
+        
+    def _check_memory(self, stage):
+        """Sample the RSS after a load/process step and, near the budget, free
+        the raw frames (reloadable from SQLite) and spill finished KPI tables"""
+        if not self.memory:
+            return
+        self.memory.sample(stage)
+        if self.memory.near_limit():
+            self.memory.release(self, 'df_accounts', 'df_support_cases')
+            self.memory.spill(self, KPI_TABLES)
+        
+    def enforce_memory_budget(self):
+        """Free the raw frames once KPIs exist and spill to disk near the budget"""
+        if not self.memory:
+            return
+        
+        print("\n" + "=" * 80)
+        print(f"MEMORY BUDGET: {self.memory.budget_mb:,} MB")
+        print("=" * 80)
+        
+        # Everything downstream only needs the KPI tables and summary stats
+        self._summary_stats = self.summary_stats()
+        self.memory.release(self, 'df_accounts', 'df_support_cases')
+        
+        # The SQLite tables already live in the staging files
+        self.memory.spill(self, KPI_TABLES)
+        
+        print("✅ Raw DataFrames released")
+        if self.memory.spilled:
+            print(f"💾 Spilled to disk: {', '.join(self.memory.spilled)}")
 
     def run_full_analysis(self):
         """Execute complete analysis pipeline"""
@@ -794,25 +1119,39 @@ class DataAnalysisPipeline:
         print("DATA ANALYSIS CHALLENGE - FULL PIPELINE EXECUTION")
         print("🚀" * 40)
         
-        self.load_data()
-        self.process_data()
-        self.export_kpis()
-        self.create_visualizations()
-        self.generate_insights()
+        self._timed('load_data', self.load_data)
+        self._timed('process_data', self.process_data)
+        self._timed('enforce_memory_budget', self.enforce_memory_budget)
+        self._timed('export_kpis', self.export_kpis)
+        self._timed('create_visualizations', self.create_visualizations)
+        self._timed('generate_insights', self.generate_insights)
+        self.generate_report()
         
         print("\n" + "✅" * 40)
         print("ANALYSIS COMPLETED SUCCESSFULLY!")
         print("✅" * 40)
         
-        # Close database connection
+        if self.memory:
+            print(f"\n📈 Memory high-water mark: {self.memory.high_water_mb:,.0f} MB "
+                  f"(budget {self.memory.budget_mb:,} MB)")
+        
+        self.close()
+        
+    def close(self):
+        """Close the database connection and remove the run's scratch files"""
         self.conn.close()
+        if self.staging_dir:
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+        if self.memory:
+            self.memory.cleanup()
 
 
 if __name__ == "__main__":
     # Initialize and run pipeline
     pipeline = DataAnalysisPipeline(
         accounts_path=config.ACCOUNTS_FILE,
-        support_cases_path=config.SUPPORT_CASES_FILE
+        support_cases_path=config.SUPPORT_CASES_FILE,
+        filters=config.LOAD_FILTERS
     )
     
     pipeline.run_full_analysis()
\ No newline at end of file
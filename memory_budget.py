@@ -0,0 +1,146 @@
+"""
+Memory-bounded execution - track the process RSS against a configured
+budget and spill intermediate results to disk when it gets close.
+
+KPI tables declared as `SpillableFrame` attributes on the pipeline can be
+moved to a pickle on disk by `MemoryBudget.spill`; reading the attribute
+afterwards transparently loads the table back for the caller without
+keeping it resident on the pipeline, so callers should read it once and
+only where it is actually needed.
+"""
+
+import gc
+import hashlib
+import os
+import shutil
+import sys
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1024 * 1024
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB (None if unavailable)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / MB
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """High-water mark of the RSS in MB as reported by the OS (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / MB if sys.platform == 'darwin' else peak / 1024
+
+
+class SpilledFrame:
+    """Handle to a DataFrame that was written to disk"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        return pd.read_pickle(self.path)
+    
+    def digest(self):
+        """sha256 of the spill file, for fingerprinting without loading it"""
+        digest = hashlib.sha256()
+        with open(self.path, 'rb') as f:
+            for chunk in iter(lambda: f.read(MB), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+def stored_value(obj, name):
+    """Value behind a SpillableFrame attribute: a DataFrame, or the
+    SpilledFrame handle as is instead of loading it back"""
+    return obj.__dict__.get(name)
+
+
+class SpillableFrame:
+    """Descriptor for pipeline attributes that may be spilled to disk"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = obj.__dict__.get(self.name)
+        if isinstance(value, SpilledFrame):
+            return value.load()
+        return value
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+
+
+class MemoryBudget:
+    """RSS budget with spill-to-disk and high-water mark reporting"""
+
+    def __init__(self, budget_mb, spill_threshold, spill_dir):
+        self.budget_mb = budget_mb
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self.high_water_mb = 0.0
+        self.samples = {}
+        self.spilled = []
+
+    def sample(self, stage):
+        """Record the RSS at the end of a stage and update the high-water mark"""
+        rss = current_rss_mb()
+        if rss is None:
+            return None
+        self.samples[stage] = rss
+        self.high_water_mb = max(self.high_water_mb, rss, peak_rss_mb() or 0.0)
+        if rss > self.budget_mb:
+            print(f"⚠️  RSS {rss:,.0f} MB exceeds the {self.budget_mb:,} MB budget after {stage}")
+        return rss
+
+    def near_limit(self):
+        rss = current_rss_mb()
+        return rss is not None and rss >= self.budget_mb * self.spill_threshold
+
+    def release(self, obj, *names):
+        """Drop attributes from `obj` and return the memory to the allocator"""
+        for name in names:
+            setattr(obj, name, None)
+        gc.collect()
+
+    def spill(self, obj, names):
+        """Spill SpillableFrame attributes of `obj`, largest first, until under the threshold"""
+        os.makedirs(self.spill_dir, exist_ok=True)
+        sizes = {
+            name: obj.__dict__[name].memory_usage(deep=True).sum() for name in names
+            if isinstance(obj.__dict__.get(name), pd.DataFrame)
+        }
+        for name in sorted(sizes, key=sizes.get, reverse=True):
+            if not self.near_limit():
+                break
+            path = os.path.join(self.spill_dir, f'{name}.pkl')
+            obj.__dict__[name].to_pickle(path)
+            setattr(obj, name, SpilledFrame(path))
+            self.spilled.append(name)
+            gc.collect()
+
+    def summary(self):
+        return {
+            'budget_mb': self.budget_mb,
+            'high_water_mb': round(self.high_water_mb, 1),
+            'spilled': list(self.spilled),
+        }
+
+    def cleanup(self):
+        """Remove spilled files once the run is over"""
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
@@ -0,0 +1,74 @@
+"""
+Synthetic dataset generator - deterministic accounts / support cases files
+in the same JSON format as the anonymized exports, for benchmarks and
+golden-output regression checks.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+COUNTRIES = ['United States', 'United Kingdom', 'Germany', 'Brazil', 'India',
+             'China', 'Mexico', 'France', 'Japan', 'Pakistan']
+INDUSTRIES = ['Pharmaceuticals', 'Printing', 'Packaging and Containers', 'Food & Beverage',
+              'Medical Devices', 'Chemicals', 'Information Technology', None]
+PRIORITIES = ['Critical', 'High', 'Medium', 'Low']
+STATUSES = ['Closed', 'Open', 'Pending']
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def generate(n_accounts=300, n_cases=5000, seed=42, start='2024-01-01', days=180):
+    """Return (accounts, support_cases) as lists of JSON-ready records"""
+    rng = np.random.RandomState(seed)
+    start = pd.Timestamp(start)
+
+    account_ids = [f'acc_{i:06d}' for i in range(n_accounts)]
+    account_created = start - pd.to_timedelta(rng.randint(0, 3650 * 86400, n_accounts), unit='s')
+    accounts = [
+        {
+            'account_sfid': account_ids[i],
+            'account_name': f'Customer_{i:06d}',
+            'account_created_date': account_created[i].strftime(DATE_FORMAT),
+            'account_country': COUNTRIES[rng.randint(len(COUNTRIES))],
+            'account_industry': INDUSTRIES[rng.randint(len(INDUSTRIES))],
+        }
+        for i in range(n_accounts)
+    ]
+
+    # Skewed case volume per account, like the real data
+    weights = rng.pareto(1.5, n_accounts) + 1
+    owners = rng.choice(n_accounts, size=n_cases, p=weights / weights.sum())
+    created = start + pd.to_timedelta(rng.randint(0, days * 86400, n_cases), unit='s')
+    statuses = rng.choice(len(STATUSES), size=n_cases, p=[0.6, 0.25, 0.15])
+    priorities = rng.choice(len(PRIORITIES), size=n_cases, p=[0.1, 0.25, 0.4, 0.25])
+    resolution = pd.to_timedelta(np.round(rng.exponential(7 * 86400, n_cases)), unit='s')
+
+    support_cases = []
+    for i in range(n_cases):
+        status = STATUSES[statuses[i]]
+        closed = created[i] + resolution[i] if status == 'Closed' else None
+        support_cases.append({
+            'case_sfid': f'case_{i:08d}',
+            'account_sfid': account_ids[owners[i]],
+            'case_created_date': created[i].strftime(DATE_FORMAT),
+            'case_closed_date': closed.strftime(DATE_FORMAT) if closed is not None else None,
+            'case_status': status,
+            'case_priority': PRIORITIES[priorities[i]],
+        })
+    return accounts, support_cases
+
+
+def write_dataset(output_dir, **kwargs):
+    """Write accounts/support cases JSON files and return their paths"""
+    accounts, support_cases = generate(**kwargs)
+    os.makedirs(output_dir, exist_ok=True)
+    accounts_path = os.path.join(output_dir, 'accounts_synthetic.json')
+    support_cases_path = os.path.join(output_dir, 'support_cases_synthetic.json')
+    with open(accounts_path, 'w', encoding='utf-8') as f:
+        json.dump(accounts, f)
+    with open(support_cases_path, 'w', encoding='utf-8') as f:
+        json.dump(support_cases, f)
+    return accounts_path, support_cases_path